@@ -3,20 +3,46 @@
 import os
 import re
 import hashlib
+import struct
+import threading
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import subprocess
 
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config as BotoConfig
+from botocore.exceptions import ClientError
 from tqdm import tqdm
 
 from .config_loader import get_config
 from .db import DatabaseSession, Video
 
+# Split large videos into 64 MB parts uploaded in parallel. Keep
+# upload_concurrency * max_concurrency around 40 in-flight parts.
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=64 * 1024 * 1024,
+    multipart_chunksize=64 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True,
+)
+
+# Number of registered videos per database commit
+_COMMIT_BATCH_SIZE = 50
+
+_DATE8 = re.compile(r'(\d{8})')
+_DATE6 = re.compile(r'(\d{6}) -')
+_SAFE = re.compile(r'[^\w\-_\.]')
+
+# Era descriptions by event year
+_TENURE = {y: f"From Dan Goldin's tenure as NASA Administrator ({y})" for y in range(1992, 2002)}
+_POST_NASA = "Post-NASA speaking engagement ({})"
+_POST = {y: _POST_NASA.format(y) for y in range(2002, 2101)}
+
 
 def extract_metadata_from_path(file_path: Path) -> dict:
     """Extract metadata from folder/file naming conventions."""
-    path_str = str(file_path)
     metadata = {
         'speaker': 'Dan Goldin',  # Default for this archive
         'event_name': None,
@@ -24,49 +50,101 @@ def extract_metadata_from_path(file_path: Path) -> dict:
         'description': None,
     }
 
-    # Try to extract date from folder name (YYYYMMDD format)
-    date_match = re.search(r'(\d{8})', path_str)
-    if date_match:
+    # Scan path components once: dates never span a separator, so matching
+    # each part is equivalent to searching the whole path string.
+    # Folders look like "YYYYMMDD - Event Name" or "YYYYMM - Event Name".
+    date8 = None
+    date6 = None
+    for part in file_path.parts:
+        if date8 is None:
+            match = _DATE8.search(part)
+            if match:
+                date8 = match.group(1)
+        if date6 is None:
+            match = _DATE6.match(part)
+            if match:
+                date6 = match.group(1)
+        if metadata['event_name'] is None and ' - ' in part:
+            metadata['event_name'] = part.split(' - ', 1)[1].strip()
+
+    # Try YYYYMMDD format
+    if date8:
         try:
-            date_str = date_match.group(1)
-            metadata['event_date'] = datetime.strptime(date_str, '%Y%m%d').date()
+            metadata['event_date'] = datetime.strptime(date8, '%Y%m%d').date()
         except ValueError:
             pass
 
     # Try YYYYMM format
-    if not metadata['event_date']:
-        date_match = re.search(r'/(\d{6}) -', path_str)
-        if date_match:
-            try:
-                date_str = date_match.group(1)
-                metadata['event_date'] = datetime.strptime(date_str + '01', '%Y%m%d').date()
-            except ValueError:
-                pass
-
-    # Extract event name from folder structure
-    # Pattern: "YYYYMMDD - Event Name" or "Event Name"
-    parts = file_path.parts
-    for part in parts:
-        if ' - ' in part:
-            # Format: "YYYYMMDD - Event Name"
-            event_part = part.split(' - ', 1)
-            if len(event_part) > 1:
-                metadata['event_name'] = event_part[1].strip()
-                break
+    if not metadata['event_date'] and date6:
+        try:
+            metadata['event_date'] = datetime.strptime(date6 + '01', '%Y%m%d').date()
+        except ValueError:
+            pass
 
     # Determine era for description
     if metadata['event_date']:
         year = metadata['event_date'].year
-        if 1992 <= year <= 2001:
-            metadata['description'] = f"From Dan Goldin's tenure as NASA Administrator ({year})"
-        elif year > 2001:
-            metadata['description'] = f"Post-NASA speaking engagement ({year})"
+        metadata['description'] = (
+            _TENURE.get(year)
+            or _POST.get(year)
+            or (_POST_NASA.format(year) if year > 2001 else None)
+        )
 
     return metadata
 
 
+def _read_mp4_duration(file_path: Path) -> float:
+    """Read duration from the MP4/MOV moov/mvhd box without spawning ffprobe.
+
+    Walks the top-level boxes with seeks (so a trailing moov after a multi-GB
+    mdat costs nothing), then reads timescale and duration from mvhd.
+    Returns 0 if the container can't be parsed.
+    """
+    with open(file_path, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        start, end = 0, file_size
+        for target in (b'moov', b'mvhd'):
+            offset = start
+            found = None
+            while offset + 8 <= end:
+                f.seek(offset)
+                size, box_type = struct.unpack('>I4s', f.read(8))
+                header = 8
+                if size == 1:
+                    size = struct.unpack('>Q', f.read(8))[0]
+                    header = 16
+                elif size == 0:
+                    size = end - offset
+                if size < header:
+                    return 0
+                if box_type == target:
+                    found = (offset + header, offset + size)
+                    break
+                offset += size
+            if found is None:
+                return 0
+            start, end = found
+
+        f.seek(start)
+        version = f.read(4)[0]
+        if version == 1:
+            f.seek(16, 1)
+            timescale, duration = struct.unpack('>IQ', f.read(12))
+        else:
+            f.seek(8, 1)
+            timescale, duration = struct.unpack('>II', f.read(8))
+        return duration / timescale if timescale else 0
+
+
 def get_video_duration(file_path: Path) -> float:
-    """Get video duration using ffprobe."""
+    """Get video duration from the container header, falling back to ffprobe."""
+    try:
+        duration = _read_mp4_duration(file_path)
+        if duration > 0:
+            return duration
+    except (OSError, struct.error, IndexError):
+        pass
+
     try:
         result = subprocess.run([
             'ffprobe', '-v', 'error',
@@ -79,16 +157,114 @@ def get_video_duration(file_path: Path) -> float:
         return 0
 
 
+def _upload_one(video_path: Path, s3, bucket: str, existing_names: set, names_lock: threading.Lock):
+    """Upload a single video to S3. Runs in a worker thread.
+
+    Returns (status, name, result) where result is the unsaved Video row
+    on success or the exception on failure. Database writes stay on the
+    main thread, which owns the session. existing_names is shared between
+    workers and must only be touched while holding names_lock.
+    """
+    name = video_path.name
+    try:
+        # Claim the filename so duplicates in this run are skipped too
+        with names_lock:
+            if name in existing_names:
+                return 'skipped', name, None
+            existing_names.add(name)
+
+        # Generate unique S3 key
+        suffix = video_path.suffix.lower().lstrip('.')
+        file_hash = hashlib.md5(str(video_path).encode()).hexdigest()[:8]
+        s3_key = f"videos/{_SAFE.sub('_', video_path.stem)}_{file_hash}.{suffix}"
+
+        # Get file info
+        file_size = video_path.stat().st_size
+
+        # The key is deterministic, so an object left by an interrupted run
+        # (uploaded but never registered) can be reused instead of re-sent
+        try:
+            head = s3.head_object(Bucket=bucket, Key=s3_key)
+            already_in_s3 = head['ContentLength'] == file_size
+        except ClientError:
+            already_in_s3 = False
+
+        # Upload to S3
+        if not already_in_s3:
+            s3.upload_file(
+                str(video_path),
+                bucket,
+                s3_key,
+                ExtraArgs={'ContentType': 'video/mp4'},
+                Config=_TRANSFER_CONFIG,
+            )
+
+        # Duration and path metadata are only needed for the database row,
+        # so skipped files never pay for them
+        duration = get_video_duration(video_path)
+        metadata = extract_metadata_from_path(video_path)
+
+        video = Video(
+            filename=name,
+            original_filename=name,
+            s3_key=s3_key,
+            s3_bucket=bucket,
+            file_size_bytes=file_size,
+            duration_seconds=duration if duration > 0 else None,
+            format=suffix,
+            status='uploaded',
+            speaker=metadata['speaker'],
+            event_name=metadata['event_name'],
+            event_date=metadata['event_date'],
+            description=metadata['description'],
+        )
+        return 'uploaded', name, video
+
+    except Exception as e:
+        # Release the name so a same-named file elsewhere still gets a try
+        with names_lock:
+            existing_names.discard(name)
+        return 'failed', name, e
+
+
+def _commit_batch(session, videos: list) -> int:
+    """Register a batch of videos, falling back to one row at a time.
+
+    A single bad row (e.g. an over-long event name) must not roll back the
+    rest of the batch. Returns the number of rows that could not be saved.
+    """
+    session.add_all(videos)
+    try:
+        session.commit()
+        return 0
+    except Exception:
+        session.rollback()
+
+    not_saved = 0
+    for video in videos:
+        session.add(video)
+        try:
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            print(f"\nFailed to register: {video.original_filename}: {e}")
+            not_saved += 1
+    return not_saved
+
+
 def batch_upload(source_dir: str, dry_run: bool = False):
     """Upload all videos from source directory to S3."""
     config = get_config()
     source_path = Path(source_dir)
 
-    # Find all video files
-    video_extensions = {'.mp4', '.mov', '.MP4', '.MOV'}
-    video_files = []
-    for ext in video_extensions:
-        video_files.extend(source_path.rglob(f'*{ext}'))
+    # Find all video files in a single walk (extension match is case-insensitive)
+    video_extensions = {'.mp4', '.mov'}
+    video_files = [
+        Path(root) / name
+        for root, _, files in os.walk(source_path)
+        for name in files
+        if os.path.splitext(name)[1].lower() in video_extensions
+    ]
 
     print(f"Found {len(video_files)} videos to upload")
 
@@ -98,12 +274,13 @@ def batch_upload(source_dir: str, dry_run: bool = False):
         print(f"  ... and {len(video_files) - 10} more")
         return
 
-    # Initialize S3
+    # Initialize S3 (one client shared by all worker threads)
     s3 = boto3.client(
         's3',
         aws_access_key_id=config.aws_access_key,
         aws_secret_access_key=config.aws_secret_key,
         region_name=config.aws_region,
+        config=BotoConfig(max_pool_connections=50),
     )
     bucket = config.s3_bucket
 
@@ -111,60 +288,46 @@ def batch_upload(source_dir: str, dry_run: bool = False):
     skipped = 0
     failed = 0
 
-    for video_path in tqdm(video_files, desc="Uploading"):
-        try:
-            # Generate unique S3 key
-            file_hash = hashlib.md5(str(video_path).encode()).hexdigest()[:8]
-            safe_name = re.sub(r'[^\w\-_\.]', '_', video_path.name)
-            s3_key = f"videos/{safe_name.rsplit('.', 1)[0]}_{file_hash}.{video_path.suffix.lower().lstrip('.')}"
-
-            # Check if already exists in database
-            with DatabaseSession() as session:
-                existing = session.query(Video).filter(
-                    Video.original_filename == video_path.name
-                ).first()
-                if existing:
-                    skipped += 1
-                    continue
-
-            # Get file info
-            file_size = video_path.stat().st_size
-            duration = get_video_duration(video_path)
-            metadata = extract_metadata_from_path(video_path)
-
-            # Upload to S3
-            s3.upload_file(
-                str(video_path),
-                bucket,
-                s3_key,
-                ExtraArgs={'ContentType': 'video/mp4'},
-                Callback=None
-            )
+    with DatabaseSession() as session:
+        # Load already-registered filenames once instead of querying per file
+        existing_names = {row[0] for row in session.query(Video.original_filename).all()}
+        # End the read transaction now; uploads can take hours before the first commit
+        session.commit()
+        names_lock = threading.Lock()
 
-            # Register in database
-            with DatabaseSession() as session:
-                video = Video(
-                    filename=video_path.name,
-                    original_filename=video_path.name,
-                    s3_key=s3_key,
-                    s3_bucket=bucket,
-                    file_size_bytes=file_size,
-                    duration_seconds=duration if duration > 0 else None,
-                    format=video_path.suffix.lower().lstrip('.'),
-                    status='uploaded',
-                    speaker=metadata['speaker'],
-                    event_name=metadata['event_name'],
-                    event_date=metadata['event_date'],
-                    description=metadata['description'],
-                )
-                session.add(video)
-                session.commit()
-
-            uploaded += 1
+        with ThreadPoolExecutor(max_workers=config.upload_concurrency) as executor:
+            # Submit everything up front and handle results as they finish, so one
+            # slow file never holds back the rest (no chunked wait()/map()).
+            futures = [
+                executor.submit(_upload_one, p, s3, bucket, existing_names, names_lock)
+                for p in video_files
+            ]
+            pending = []
+            try:
+                for future in tqdm(as_completed(futures), total=len(futures), desc="Uploading"):
+                    status, name, result = future.result()
+                    if status == 'uploaded':
+                        # Register in database, committing in batches
+                        pending.append(result)
+                        if len(pending) == _COMMIT_BATCH_SIZE:
+                            not_saved = _commit_batch(session, pending)
+                            uploaded += len(pending) - not_saved
+                            failed += not_saved
+                            pending = []
+                    elif status == 'skipped':
+                        skipped += 1
+                    else:
+                        print(f"\nFailed: {name}: {result}")
+                        failed += 1
+            except BaseException:
+                # Ctrl-C or a database error: don't upload the remaining queue
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
 
-        except Exception as e:
-            print(f"\nFailed: {video_path.name}: {e}")
-            failed += 1
+        if pending:
+            not_saved = _commit_batch(session, pending)
+            uploaded += len(pending) - not_saved
+            failed += not_saved
 
     print(f"\nComplete: {uploaded} uploaded, {skipped} skipped, {failed} failed")
 
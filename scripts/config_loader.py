@@ -72,6 +72,10 @@ class ConfigLoader:
     def s3_prefixes(self) -> Dict[str, str]:
         return self.settings.get("aws", {}).get("s3", {}).get("prefixes", {})
 
+    @property
+    def upload_concurrency(self) -> int:
+        return self.settings.get("aws", {}).get("s3", {}).get("upload_concurrency", 4)
+
     @property
     def aws_access_key(self) -> str:
         # Try credentials.yaml first, then secrets.yaml
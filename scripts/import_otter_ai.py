@@ -3,16 +3,84 @@
 import os
 import re
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, date
 from pathlib import Path
 from decimal import Decimal
 
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config as BotoConfig
 from docx import Document as DocxDocument
 
 from db import get_session, AudioRecording, AudioSegment, Persona
 
 
+def _inject_keepalive(request, **kwargs):
+    """Ask older S3-compatible endpoints to keep the connection open.
+
+    Runs on before-send, after SigV4 signing, so the hop-by-hop Connection
+    header is never signed and a proxy rewriting it can't break the signature.
+    """
+    request.headers['Connection'] = 'keep-alive'
+
+
+# Shared S3 client so every upload reuses pooled connections
+_SESSION = boto3.session.Session()
+_SESSION.events.register('before-send.s3', _inject_keepalive)
+_S3 = _SESSION.client('s3', config=BotoConfig(max_pool_connections=50, tcp_keepalive=True))
+
+# Long recordings (>25 MB) upload as 16 MB parts, 4 at a time
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=25 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=4,
+    use_threads=True,
+)
+
+_DATE_PATTERNS = [
+    re.compile(r'(\w+, \w+ \d+, \d{4})'),  # "Fri, Dec 05, 2025"
+    re.compile(r'(\d{4}-\d{2}-\d{2})'),     # "2025-12-05"
+    re.compile(r'(\d{8})'),                  # "20231127"
+]
+_DURATION = re.compile(r'(\d+:\d+(?::\d+)?)\s*$')
+# Pattern: "Speaker Name  00:16" or just "00:16"
+_TIMESTAMP = re.compile(r'^(.+?)?\s*(\d+:\d+(?::\d+)?)\s*$')
+_SAFE = re.compile(r'[^\w\-_.]')
+
+
+def _parse_date_line(date_line: str, result: dict):
+    """Fill recording_date and duration_seconds from the Otter date line.
+
+    Format: "Fri, Dec 05, 2025 10:47AM • 21:01"
+    """
+    # Extract date
+    for pattern in _DATE_PATTERNS:
+        match = pattern.search(date_line)
+        if match:
+            try:
+                date_str = match.group(1)
+                if ',' in date_str:
+                    result['recording_date'] = datetime.strptime(date_str, '%a, %b %d, %Y').date()
+                elif '-' in date_str:
+                    result['recording_date'] = datetime.strptime(date_str, '%Y-%m-%d').date()
+                else:
+                    result['recording_date'] = datetime.strptime(date_str, '%Y%m%d').date()
+                break
+            except:
+                pass
+
+    # Extract duration (format: "21:01" or "1:21:01")
+    duration_match = _DURATION.search(date_line)
+    if duration_match:
+        time_str = duration_match.group(1)
+        parts = time_str.split(':')
+        if len(parts) == 2:
+            result['duration_seconds'] = int(parts[0]) * 60 + int(parts[1])
+        elif len(parts) == 3:
+            result['duration_seconds'] = int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
+
+
 def parse_otter_docx(docx_path: str) -> dict:
     """Parse an Otter AI docx file and extract metadata + segments.
 
@@ -22,15 +90,14 @@ def parse_otter_docx(docx_path: str) -> dict:
     - Lines 3-4: SUMMARY KEYWORDS / keyword list
     - Lines 5-6: SPEAKERS / speaker list
     - Rest: Alternating speaker+timestamp and text
+
+    Paragraphs are processed in a single streaming pass rather than being
+    collected into a list first.
     """
     doc = DocxDocument(docx_path)
-    paragraphs = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
-
-    if len(paragraphs) < 3:
-        return None
 
     result = {
-        'title': paragraphs[0] if paragraphs else Path(docx_path).stem,
+        'title': Path(docx_path).stem,
         'recording_date': None,
         'duration_seconds': None,
         'keywords': [],
@@ -38,67 +105,41 @@ def parse_otter_docx(docx_path: str) -> dict:
         'segments': []
     }
 
-    # Parse date and duration from line 2
-    # Format: "Fri, Dec 05, 2025 10:47AM • 21:01"
-    if len(paragraphs) > 1:
-        date_line = paragraphs[1]
-
-        # Extract date
-        date_patterns = [
-            r'(\w+, \w+ \d+, \d{4})',  # "Fri, Dec 05, 2025"
-            r'(\d{4}-\d{2}-\d{2})',     # "2025-12-05"
-            r'(\d{8})',                  # "20231127"
-        ]
-        for pattern in date_patterns:
-            match = re.search(pattern, date_line)
-            if match:
-                try:
-                    date_str = match.group(1)
-                    if ',' in date_str:
-                        result['recording_date'] = datetime.strptime(date_str, '%a, %b %d, %Y').date()
-                    elif '-' in date_str:
-                        result['recording_date'] = datetime.strptime(date_str, '%Y-%m-%d').date()
-                    else:
-                        result['recording_date'] = datetime.strptime(date_str, '%Y%m%d').date()
-                    break
-                except:
-                    pass
-
-        # Extract duration (format: "21:01" or "1:21:01")
-        duration_match = re.search(r'(\d+:\d+(?::\d+)?)\s*$', date_line)
-        if duration_match:
-            time_str = duration_match.group(1)
-            parts = time_str.split(':')
-            if len(parts) == 2:
-                result['duration_seconds'] = int(parts[0]) * 60 + int(parts[1])
-            elif len(parts) == 3:
-                result['duration_seconds'] = int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
-
-    # Parse keywords and speakers
-    i = 2
-    while i < len(paragraphs) and i < 10:
-        line = paragraphs[i]
-        if line == 'SUMMARY KEYWORDS' and i + 1 < len(paragraphs):
-            result['keywords'] = [k.strip() for k in paragraphs[i + 1].split(',')]
-            i += 2
-        elif line == 'SPEAKERS' and i + 1 < len(paragraphs):
-            result['speakers'] = [s.strip() for s in paragraphs[i + 1].split(',')]
-            i += 2
-        else:
-            i += 1
-
-    # Parse transcript segments
-    # Pattern: "Speaker Name  00:16" or just "00:16"
-    timestamp_pattern = re.compile(r'^(.+?)?\s*(\d+:\d+(?::\d+)?)\s*$')
-
     segments = []
     current_speaker = None
     current_start = None
     current_text = []
     segment_index = 0
 
-    for para in paragraphs[6:]:  # Skip header lines
-        match = timestamp_pattern.match(para)
+    line_no = 0          # index among non-empty paragraphs
+    pending_label = None  # 'keywords' or 'speakers' when the previous line was a header label
+
+    for p in doc.paragraphs:
+        para = p.text.strip()
+        if not para:
+            continue
+        n = line_no
+        line_no += 1
+
+        # Header: title, date line, then SUMMARY KEYWORDS / SPEAKERS lists
+        if n == 0:
+            result['title'] = para
+        elif n == 1:
+            _parse_date_line(para, result)
+        elif pending_label:
+            result[pending_label] = [item.strip() for item in para.split(',')]
+            pending_label = None
+        elif n < 10:
+            if para == 'SUMMARY KEYWORDS':
+                pending_label = 'keywords'
+            elif para == 'SPEAKERS':
+                pending_label = 'speakers'
+
+        if n < 6:  # Skip header lines
+            continue
+
+        # Parse transcript segments
+        match = _TIMESTAMP.match(para)
         if match:
             # Save previous segment if exists
             if current_start is not None and current_text:
@@ -127,9 +168,12 @@ def parse_otter_docx(docx_path: str) -> dict:
             current_text = []
         else:
             # This is transcript text
-            if para and not para.startswith('SUMMARY') and not para.startswith('SPEAKERS'):
+            if not para.startswith(('SUMMARY', 'SPEAKERS')):
                 current_text.append(para)
 
+    if line_no < 3:
+        return None
+
     # Don't forget the last segment
     if current_start is not None and current_text:
         segments.append({
@@ -152,15 +196,12 @@ def parse_otter_docx(docx_path: str) -> dict:
     return result
 
 
-def upload_to_s3(local_path: str, s3_key: str, bucket: str = 'mv-brain') -> bool:
-    """Upload file to S3."""
-    try:
-        s3 = boto3.client('s3')
-        s3.upload_file(local_path, bucket, s3_key)
-        return True
-    except Exception as e:
-        print(f"  Error uploading to S3: {e}")
-        return False
+def upload_to_s3(local_path: str, s3_key: str, bucket: str = 'mv-brain'):
+    """Upload file to S3.
+
+    Raises on failure so the caller can report the error with its file.
+    """
+    _S3.upload_file(local_path, bucket, s3_key, Config=_TRANSFER_CONFIG)
 
 
 def get_file_size(path: str) -> int:
@@ -168,13 +209,45 @@ def get_file_size(path: str) -> int:
     return os.path.getsize(path)
 
 
-def import_otter_export(export_dir: str, persona_name: str = None, upload_audio: bool = True):
+def _prepare_export(docx_path: Path, mp3_path: Path, upload_audio: bool):
+    """Parse a docx and upload its mp3. Runs in a worker thread.
+
+    Returns (parsed, s3_key, safe_filename, error) where error is a message
+    when the pair could not be prepared.
+    """
+    try:
+        parsed = parse_otter_docx(str(docx_path))
+        if not parsed:
+            return None, None, None, "Error: Could not parse docx"
+    except Exception as e:
+        return None, None, None, f"Error parsing docx: {e}"
+
+    # Generate S3 key
+    safe_filename = _SAFE.sub('_', docx_path.stem)
+    s3_key = f"audio/otter_ai/{safe_filename}_{uuid.uuid4().hex[:8]}.mp3"
+
+    # Upload to S3
+    if upload_audio:
+        try:
+            upload_to_s3(str(mp3_path), s3_key)
+        except Exception as e:
+            return None, None, None, f"Error uploading to S3 ({s3_key}): {e}"
+
+    return parsed, s3_key, safe_filename, None
+
+
+def import_otter_export(export_dir: str, persona_name: str = None, upload_audio: bool = True,
+                        max_workers: int = 4):
     """Import all Otter AI exports from a directory.
 
+    Docx parsing and mp3 uploads run on a thread pool; database writes happen
+    serially on the calling thread as each file finishes.
+
     Args:
         export_dir: Directory containing .docx and .mp3 file pairs
         persona_name: Optional persona name to associate recordings with
         upload_audio: Whether to upload mp3 files to S3
+        max_workers: Number of files to parse/upload concurrently
     """
     export_path = Path(export_dir)
 
@@ -192,89 +265,97 @@ def import_otter_export(export_dir: str, persona_name: str = None, upload_audio:
             persona_id = persona.id
             print(f"Associating with persona: {persona.name}")
 
+    # Load already-imported filenames once instead of querying per file
+    existing_names = {row[0] for row in session.query(AudioRecording.original_filename).all()}
+
     imported = 0
     skipped = 0
     errors = 0
 
+    # Filter out pairs that can be skipped without touching the file contents
+    pending = []
     for docx_path in docx_files:
-        filename_stem = docx_path.stem
         mp3_path = docx_path.with_suffix('.mp3')
 
-        print(f"\nProcessing: {filename_stem}")
-
         # Check if mp3 exists
         if not mp3_path.exists():
+            print(f"\nProcessing: {docx_path.stem}")
             print(f"  Warning: No matching mp3 file, skipping")
             skipped += 1
             continue
 
         # Check if already imported (by original filename)
-        existing = session.query(AudioRecording).filter(
-            AudioRecording.original_filename == mp3_path.name
-        ).first()
-        if existing:
+        if mp3_path.name in existing_names:
+            print(f"\nProcessing: {docx_path.stem}")
             print(f"  Already imported, skipping")
             skipped += 1
             continue
 
-        # Parse docx
-        try:
-            parsed = parse_otter_docx(str(docx_path))
-            if not parsed:
-                print(f"  Error: Could not parse docx")
-                errors += 1
-                continue
-        except Exception as e:
-            print(f"  Error parsing docx: {e}")
-            errors += 1
-            continue
+        existing_names.add(mp3_path.name)
+        pending.append((docx_path, mp3_path))
 
-        # Generate S3 key
-        safe_filename = re.sub(r'[^\w\-_.]', '_', filename_stem)
-        s3_key = f"audio/otter_ai/{safe_filename}_{uuid.uuid4().hex[:8]}.mp3"
-
-        # Upload to S3
-        if upload_audio:
-            print(f"  Uploading to S3: {s3_key}")
-            if not upload_to_s3(str(mp3_path), s3_key):
-                errors += 1
-                continue
-
-        # Create AudioRecording
-        recording = AudioRecording(
-            filename=f"{safe_filename}.mp3",
-            original_filename=mp3_path.name,
-            s3_key=s3_key,
-            s3_bucket='mv-brain',
-            file_size_bytes=get_file_size(str(mp3_path)),
-            duration_seconds=parsed['duration_seconds'],
-            format='mp3',
-            title=parsed['title'],
-            recording_date=parsed['recording_date'],
-            speakers=parsed['speakers'],
-            keywords=parsed['keywords'],
-            persona_id=persona_id,
-            source='otter_ai',
-            status='transcribed'
-        )
-        session.add(recording)
-        session.flush()  # Get the ID
-
-        # Create segments
-        for seg in parsed['segments']:
-            segment = AudioSegment(
-                audio_id=recording.id,
-                segment_index=seg['segment_index'],
-                start_time=Decimal(str(seg['start_time'])),
-                end_time=Decimal(str(seg['end_time'])),
-                text=seg['text'],
-                speaker=seg['speaker']
-            )
-            session.add(segment)
-
-        session.commit()
-        print(f"  Imported: {len(parsed['segments'])} segments")
-        imported += 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Queue every pair at once; as_completed lets a free worker pick up the
+        # next file immediately instead of waiting on a long recording.
+        futures = {
+            executor.submit(_prepare_export, docx_path, mp3_path, upload_audio): (docx_path, mp3_path)
+            for docx_path, mp3_path in pending
+        }
+        try:
+            for future in as_completed(futures):
+                docx_path, mp3_path = futures[future]
+                parsed, s3_key, safe_filename, error = future.result()
+
+                print(f"\nProcessing: {docx_path.stem}")
+                if error:
+                    print(f"  {error}")
+                    errors += 1
+                    continue
+                if upload_audio:
+                    print(f"  Uploaded to S3: {s3_key}")
+
+                # Create AudioRecording
+                recording = AudioRecording(
+                    filename=f"{safe_filename}.mp3",
+                    original_filename=mp3_path.name,
+                    s3_key=s3_key,
+                    s3_bucket='mv-brain',
+                    file_size_bytes=get_file_size(str(mp3_path)),
+                    duration_seconds=parsed['duration_seconds'],
+                    format='mp3',
+                    title=parsed['title'],
+                    recording_date=parsed['recording_date'],
+                    speakers=parsed['speakers'],
+                    keywords=parsed['keywords'],
+                    persona_id=persona_id,
+                    source='otter_ai',
+                    status='transcribed'
+                )
+                session.add(recording)
+                session.flush()  # Get the ID
+
+                # Create segments in one bulk insert
+                session.bulk_save_objects([
+                    AudioSegment(
+                        audio_id=recording.id,
+                        segment_index=seg['segment_index'],
+                        start_time=Decimal(seg['start_time']),
+                        end_time=Decimal(seg['end_time']),
+                        text=seg['text'],
+                        speaker=seg['speaker']
+                    )
+                    for seg in parsed['segments']
+                ])
+
+                session.commit()
+                print(f"  Imported: {len(parsed['segments'])} segments")
+                imported += 1
+        except BaseException:
+            # Stop queued uploads: their random keys would be orphaned in S3
+            executor.shutdown(wait=False, cancel_futures=True)
+            session.rollback()
+            session.close()
+            raise
 
     session.close()
     print(f"\n=== Import Complete ===")